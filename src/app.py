@@ -1,11 +1,8 @@
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import io
-from stock_analyzer import StockAnalyzer
+import gzip
 from utils import format_currency, format_percentage, validate_symbol
 
 # Configure page
@@ -16,6 +13,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Volume histories longer than this are aggregated to weekly bars
+VOLUME_RESAMPLE_THRESHOLD = 500
+
 # Initialize session state
 if 'stock_data' not in st.session_state:
     st.session_state.stock_data = None
@@ -54,13 +54,6 @@ def main():
             index=3  # Default to 1 Year
         )
         
-        # Chart type selection
-        chart_type = st.selectbox(
-            "Chart Type",
-            options=["Line Chart", "Candlestick Chart"],
-            index=0
-        )
-        
         # Analyze button
         analyze_button = st.button("🔍 Analyze Stock", type="primary")
         
@@ -72,22 +65,22 @@ def main():
             # CSV download button
             csv_data = prepare_csv_download()
             st.download_button(
-                label="📥 Download CSV",
+                label="📥 Download CSV (.gz)",
                 data=csv_data,
-                file_name=f"{st.session_state.current_symbol}_analysis_{datetime.now().strftime('%Y%m%d')}.csv",
-                mime="text/csv"
+                file_name=f"{st.session_state.current_symbol}_analysis_{datetime.now().strftime('%Y%m%d')}.csv.gz",
+                mime="application/gzip"
             )
     
     # Main content area
     if analyze_button and symbol:
         if validate_symbol(symbol):
             st.session_state.current_symbol = symbol
-            analyze_stock(symbol, timeframe_options[selected_timeframe], chart_type)
+            analyze_stock(symbol, timeframe_options[selected_timeframe])
         else:
             st.error("❌ Please enter a valid stock symbol (e.g., AAPL, MSFT, GOOGL)")
     
     elif st.session_state.stock_data is not None:
-        display_analysis(st.session_state.stock_data, chart_type)
+        display_analysis(st.session_state.stock_data)
     
     else:
         # Welcome screen
@@ -103,11 +96,14 @@ def main():
             col = [col1, col2, col3, col4][i % 4]
             if col.button(f"📊 {stock}", key=f"popular_{stock}"):
                 st.session_state.current_symbol = stock
-                analyze_stock(stock, "1y", "Line Chart")
+                analyze_stock(stock, "1y")
 
-def analyze_stock(symbol, period, chart_type):
+def analyze_stock(symbol, period):
     """Analyze stock data and update session state"""
     
+    # Imported lazily so the welcome screen does not pay for yfinance
+    from stock_analyzer import StockAnalyzer
+    
     with st.spinner(f"🔄 Fetching data for {symbol}..."):
         try:
             analyzer = StockAnalyzer()
@@ -118,12 +114,12 @@ def analyze_stock(symbol, period, chart_type):
                 return
             
             st.session_state.stock_data = stock_data
-            display_analysis(stock_data, chart_type)
+            display_analysis(stock_data)
             
         except Exception as e:
             st.error(f"❌ Error analyzing stock: {str(e)}")
 
-def display_analysis(stock_data, chart_type):
+def display_analysis(stock_data):
     """Display the complete stock analysis"""
     
     symbol = stock_data['info']['symbol']
@@ -172,31 +168,59 @@ def display_analysis(stock_data, chart_type):
     
     # Charts section
     if not history.empty:
-        st.markdown("### Price Analysis")
-        
-        if chart_type == "Line Chart":
-            display_line_chart(history, symbol)
-        else:
-            display_candlestick_chart(history, symbol)
-        
-        # Volume chart
-        display_volume_chart(history, symbol)
-        
-        # Data table
-        st.markdown("### Historical Data")
-        display_data_table(history)
+        display_charts(history, symbol)
     
     else:
         st.warning("⚠️ No historical data available for this symbol")
 
-def display_line_chart(history, symbol):
+@st.fragment
+def display_charts(history, symbol):
+    """Display price and volume charts with the historical data table"""
+    
+    st.markdown("### Price Analysis")
+    
+    # Chart type selection lives in the fragment so toggling it only reruns the charts
+    chart_type = st.selectbox(
+        "Chart Type",
+        options=["Line Chart", "Candlestick Chart"],
+        index=0,
+        key="chart_type"
+    )
+    
+    # Convert the dates once so plotly serializes them in bulk for every chart
+    dates = to_chart_dates(history.index)
+    
+    if chart_type == "Line Chart":
+        display_line_chart(history, symbol, dates)
+    else:
+        display_candlestick_chart(history, symbol, dates)
+    
+    # Volume chart
+    display_volume_chart(history, symbol, dates)
+    
+    # Data table
+    st.markdown("### Historical Data")
+    display_data_table(history)
+
+def to_chart_dates(index):
+    """Convert a DatetimeIndex to a datetime64[ms] array of local dates for plotly"""
+    
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    
+    return index.to_numpy(dtype='datetime64[ms]')
+
+def display_line_chart(history, symbol, dates):
     """Display interactive line chart"""
     
+    import plotly.graph_objects as go
+    
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
-        x=history.index,
-        y=history['Close'],
+    # WebGL trace keeps long histories responsive in the browser
+    fig.add_trace(go.Scattergl(
+        x=dates,
+        y=history['Close'].to_numpy(),
         mode='lines',
         name='Close Price',
         line=dict(color='#00ff88', width=2),
@@ -215,15 +239,17 @@ def display_line_chart(history, symbol):
     
     st.plotly_chart(fig, use_container_width=True)
 
-def display_candlestick_chart(history, symbol):
+def display_candlestick_chart(history, symbol, dates):
     """Display interactive candlestick chart"""
     
+    import plotly.graph_objects as go
+    
     fig = go.Figure(data=go.Candlestick(
-        x=history.index,
-        open=history['Open'],
-        high=history['High'],
-        low=history['Low'],
-        close=history['Close'],
+        x=dates,
+        open=history['Open'].to_numpy(),
+        high=history['High'].to_numpy(),
+        low=history['Low'].to_numpy(),
+        close=history['Close'].to_numpy(),
         name=symbol,
         increasing_line_color='#00ff88',
         decreasing_line_color='#ff6b6b'
@@ -240,21 +266,32 @@ def display_candlestick_chart(history, symbol):
     
     st.plotly_chart(fig, use_container_width=True)
 
-def display_volume_chart(history, symbol):
+def display_volume_chart(history, symbol, dates):
     """Display volume chart"""
     
+    import plotly.graph_objects as go
+    
+    volume = history['Volume']
+    title = f"{symbol} - Trading Volume"
+    
+    # Pre-aggregate long histories so the browser renders fewer bars
+    if len(volume) > VOLUME_RESAMPLE_THRESHOLD:
+        volume = volume.resample('W').sum()
+        dates = to_chart_dates(volume.index)
+        title = f"{symbol} - Weekly Trading Volume"
+    
     fig = go.Figure()
     
     fig.add_trace(go.Bar(
-        x=history.index,
-        y=history['Volume'],
+        x=dates,
+        y=volume.to_numpy(),
         name='Volume',
         marker_color='rgba(0, 255, 136, 0.6)',
         hovertemplate='<b>Date:</b> %{x}<br><b>Volume:</b> %{y:,.0f}<extra></extra>'
     ))
     
     fig.update_layout(
-        title=f"{symbol} - Trading Volume",
+        title=title,
         xaxis_title="Date",
         yaxis_title="Volume",
         template="plotly_dark",
@@ -267,39 +304,56 @@ def display_volume_chart(history, symbol):
 def display_data_table(history):
     """Display historical data table"""
     
-    # Prepare data for display
-    display_data = history.copy()
-    
-    # Format columns
     price_columns = ['Open', 'High', 'Low', 'Close', 'Adj Close']
-    for col in price_columns:
-        if col in display_data.columns:
-            display_data[col] = display_data[col].apply(lambda x: f"${x:.2f}")
     
-    if 'Volume' in display_data.columns:
-        display_data['Volume'] = display_data['Volume'].apply(lambda x: f"{x:,.0f}")
+    dates = history.index
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
     
-    # Reset index to show dates
-    display_data = display_data.reset_index()
-    display_data['Date'] = display_data['Date'].dt.strftime('%Y-%m-%d')
+    # Keep the values numeric and let the browser format them, so sorting still works
+    columns = {'Date': dates.to_numpy()}
+    columns.update({col: history[col].to_numpy() for col in history.columns})
     
-    # Show recent data first
-    display_data = display_data.iloc[::-1].reset_index(drop=True)
+    # Show recent data first by building the frame once in reversed order
+    display_data = pd.DataFrame({col: values[::-1] for col, values in columns.items()})
+    
+    column_config = {
+        col: st.column_config.NumberColumn(format="$%.2f")
+        for col in price_columns if col in display_data.columns
+    }
+    column_config['Volume'] = st.column_config.NumberColumn(format="localized")
+    column_config['Date'] = st.column_config.DateColumn(format="YYYY-MM-DD")
     
     st.dataframe(
         display_data,
+        column_config=column_config,
         use_container_width=True,
         height=400
     )
 
 def prepare_csv_download():
-    """Prepare CSV data for download"""
+    """Prepare gzip-compressed CSV data for download"""
     
     if st.session_state.stock_data is None:
-        return ""
+        return b""
+    
+    stock_data = st.session_state.stock_data
     
-    history = st.session_state.stock_data['history'].copy()
-    info = st.session_state.stock_data['info']
+    # The timestamp is compressed per download rather than cached with the report;
+    # concatenated gzip members decompress to one continuous file
+    header = "\n".join([
+        "# Stock Analysis Report",
+        f"# Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        ""
+    ])
+    
+    return gzip.compress(header.encode("utf-8")) + build_csv_export(
+        stock_data['symbol'], stock_data['history'], stock_data['info']
+    )
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def build_csv_export(symbol, history, info):
+    """Build the gzip-compressed CSV report body for a symbol (cached across reruns)"""
     
     # Add metadata
     metadata_df = pd.DataFrame({
@@ -318,19 +372,17 @@ def prepare_csv_download():
     # Reset index for historical data
     history_df = history.reset_index()
     
-    # Combine data
-    output = io.StringIO()
-    
-    # Write metadata
-    output.write("# Stock Analysis Report\n")
-    output.write(f"# Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    output.write("\n# Company Information\n")
-    metadata_df.to_csv(output, index=False)
+    # Stream the report straight into a gzip buffer
+    buffer = io.BytesIO()
     
-    output.write("\n# Historical Price Data\n")
-    history_df.to_csv(output, index=False)
+    with io.TextIOWrapper(gzip.GzipFile(fileobj=buffer, mode="wb"), encoding="utf-8", newline="") as output:
+        output.write("\n# Company Information\n")
+        metadata_df.to_csv(output, index=False)
+        
+        output.write("\n# Historical Price Data\n")
+        history_df.to_csv(output, index=False)
     
-    return output.getvalue()
+    return buffer.getvalue()
 
 if __name__ == "__main__":
     main()
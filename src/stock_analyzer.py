@@ -1,7 +1,351 @@
 import yfinance as yf
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MARKET_INDICES = {
+    "S&P 500": "^GSPC",
+    "Dow Jones": "^DJI",
+    "NASDAQ": "^IXIC",
+    "Russell 2000": "^RUT"
+}
+
+# Upper bound on concurrent per-ticker requests to Yahoo Finance
+MAX_FETCH_WORKERS = 8
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close']
+
+# float32 resolves to better than a cent below this price, so downcasting is lossless for display
+FLOAT32_PRICE_LIMIT = 100_000
+
+# yfinance routes every Ticker through one shared HTTP session, so connections
+# are already reused across calls. Ticker objects are deliberately created per
+# fetch rather than kept around: they memoise info and news, which would then
+# outlive the st.cache_data TTLs below.
+
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False)
+def _fetch_stock_data(symbol, period):
+    """Fetch stock info, history and financials (cached across reruns)"""
+    
+    ticker = yf.Ticker(symbol)
+    
+    # Get stock info
+    info = ticker.info
+    
+    # Validate that we got valid data
+    if not info or 'symbol' not in info:
+        return None
+    
+    # Get historical data
+    history = ticker.history(period=period)
+    
+    if history.empty:
+        return None
+    
+    history = _compact_history(history)
+    
+    # Get additional financial data
+    financials = _get_financial_data(ticker)
+    
+    return {
+        'info': info,
+        'history': history,
+        'financials': financials,
+        'symbol': symbol.upper()
+    }
+
+def _compact_history(history):
+    """Downcast OHLC prices to float32 and volume to int64 to shrink the history"""
+    
+    price_columns = [col for col in PRICE_COLUMNS if col in history.columns]
+    
+    if price_columns and history[price_columns].abs().max().max() < FLOAT32_PRICE_LIMIT:
+        history = history.astype({col: 'float32' for col in price_columns})
+    
+    if 'Volume' in history.columns:
+        history = history.assign(Volume=history['Volume'].fillna(0).astype('int64'))
+    
+    return history
+
+def _get_financial_data(ticker):
+    """Get additional financial data"""
+    
+    financial_data = {}
+    
+    try:
+        # Get quarterly financials
+        quarterly_financials = ticker.quarterly_financials
+        if not quarterly_financials.empty:
+            financial_data['quarterly_financials'] = quarterly_financials
+        
+        # Get balance sheet
+        balance_sheet = ticker.balance_sheet
+        if not balance_sheet.empty:
+            financial_data['balance_sheet'] = balance_sheet
+        
+        # Get cash flow
+        cashflow = ticker.cashflow
+        if not cashflow.empty:
+            financial_data['cashflow'] = cashflow
+            
+    except Exception as e:
+        # Financial data is optional, don't fail if unavailable
+        pass
+    
+    return financial_data
+
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
+def _fetch_real_time_price(symbol):
+    """Fetch today's price data (cached across reruns)"""
+    
+    ticker = yf.Ticker(symbol)
+    todays_data = ticker.history(period='1d')
+    
+    if todays_data.empty:
+        return None
+    
+    return {
+        'current_price': todays_data['Close'].iloc[-1],
+        'open_price': todays_data['Open'].iloc[-1],
+        'high_price': todays_data['High'].iloc[-1],
+        'low_price': todays_data['Low'].iloc[-1],
+        'volume': todays_data['Volume'].iloc[-1]
+    }
+
+@st.cache_data(ttl=600, max_entries=128, show_spinner=False)
+def _fetch_company_news(symbol):
+    """Fetch the top news items for a symbol (cached across reruns)"""
+    
+    ticker = yf.Ticker(symbol)
+    news = ticker.news
+    
+    if news:
+        return news[:5]  # Return top 5 news items
+    
+    return []
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_market_summary():
+    """Fetch major market indices summary (cached across reruns)"""
+    
+    # One batched request for all indices instead of one per index
+    data = yf.download(
+        tickers=" ".join(MARKET_INDICES.values()),
+        period="2d",
+        group_by="ticker",
+        threads=True,
+        progress=False
+    )
+    
+    market_data = {}
+    
+    if data is None or data.empty:
+        return market_data
+    
+    # Latest and previous close for every index in one vectorized pass
+    closes = data.xs('Close', level=1, axis=1).ffill()
+    current = closes.iloc[-1]
+    previous = closes.iloc[-2].fillna(current) if len(closes) > 1 else current
+    change = current - previous
+    change_pct = change / previous * 100
+    
+    for name, symbol in MARKET_INDICES.items():
+        if symbol not in current.index or pd.isna(current[symbol]):
+            continue
+        
+        market_data[name] = {
+            'current': current[symbol],
+            'change': change[symbol],
+            'change_pct': change_pct[symbol]
+        }
+    
+    return market_data
+
+def _fetch_ticker_details(symbol):
+    """Fetch info and financials for a single symbol"""
+    
+    ticker = yf.Ticker(symbol)
+    
+    try:
+        info = ticker.info
+    except Exception as e:
+        return None, {}
+    
+    if not info or 'symbol' not in info:
+        return None, {}
+    
+    return info, _get_financial_data(ticker)
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def _fetch_comparison_data(symbols, period):
+    """Fetch data for several symbols at once (cached across reruns)"""
+    
+    # Yahoo expects upper-case tickers; results stay keyed by the caller's symbols
+    tickers = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    details = {}
+    
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(tickers))) as executor:
+        # download() does not return company info, so fetch it per symbol in
+        # the background while the batched history request is in flight
+        futures = {executor.submit(_fetch_ticker_details, ticker): ticker for ticker in tickers}
+        
+        # Histories for every symbol come back in a single batched request;
+        # ignore_tz=False keeps the index tz-aware like Ticker.history()
+        data = yf.download(
+            tickers=tickers,
+            period=period,
+            group_by="ticker",
+            actions=True,
+            threads=True,
+            ignore_tz=False,
+            progress=False
+        )
+        
+        for future in as_completed(futures):
+            try:
+                details[futures[future]] = future.result()
+            except Exception as e:
+                # One failing symbol should not drop the rest of the comparison
+                continue
+    
+    if data is None or data.empty:
+        return {}
+    
+    comparison_data = {}
+    
+    for symbol in symbols:
+        ticker = symbol.upper()
+        info, financials = details.get(ticker, (None, {}))
+        
+        if info is None or ticker not in data.columns.get_level_values(0):
+            continue
+        
+        history = data[ticker].dropna(how='all')
+        
+        if history.empty:
+            continue
+        
+        # download() aligns every ticker to one timezone; restore each exchange's own
+        exchange_tz = info.get('exchangeTimezoneName')
+        if exchange_tz:
+            history = history.tz_convert(exchange_tz)
+        
+        history = _compact_history(history)
+        
+        comparison_data[symbol] = {
+            'info': info,
+            'history': history,
+            'financials': financials,
+            'symbol': ticker
+        }
+    
+    return comparison_data
+
+def _window_totals(values, window):
+    """Sum of each trailing window of a 1-D array, from its running total"""
+    
+    cumulative = np.cumsum(values, dtype=np.float64)
+    
+    totals = cumulative[window - 1:].copy()
+    totals[1:] -= cumulative[:-window]
+    
+    return totals
+
+def _moving_mean(values, window):
+    """Trailing moving average of a 1-D array, NaN unless the window is fully valid"""
+    
+    result = np.full(len(values), np.nan)
+    
+    if len(values) < window:
+        return result
+    
+    # Sum NaN as zero and count valid values, so a NaN only blanks the windows
+    # that contain it (same as Series.rolling(window).mean())
+    valid = ~np.isnan(values)
+    sums = _window_totals(np.where(valid, values, 0.0), window)
+    counts = _window_totals(valid, window)
+    
+    result[window - 1:] = np.where(counts == window, sums / window, np.nan)
+    
+    return result
+
+def _moving_mean_std(values, window):
+    """Trailing moving average and sample standard deviation in one pass"""
+    
+    mean = np.full(len(values), np.nan)
+    std = np.full(len(values), np.nan)
+    
+    if len(values) < window:
+        return mean, std
+    
+    valid = ~np.isnan(values)
+    
+    if not valid.any():
+        return mean, std
+    
+    # Shift by the first finite value to limit cancellation in the sum of squares
+    shift = values[valid][0]
+    shifted = np.where(valid, values - shift, 0.0)
+    
+    window_sum = _window_totals(shifted, window)
+    window_sq = _window_totals(shifted * shifted, window)
+    full = _window_totals(valid, window) == window
+    
+    with np.errstate(invalid='ignore'):
+        variance = (window_sq - window_sum * window_sum / window) / (window - 1)
+    
+    # Windows holding a NaN stay NaN, as with Series.rolling(window)
+    mean[window - 1:] = np.where(full, window_sum / window + shift, np.nan)
+    std[window - 1:] = np.where(full, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+    
+    return mean, std
+
+def _history_fingerprint(history):
+    """Cheap cache key for fetched price history (immutable once downloaded)"""
+    
+    if history.empty:
+        return (0,)
+    
+    return (history.index[0], history.index[-1], len(history), float(history['Close'].iloc[-1]))
+
+@st.cache_data(ttl=300, max_entries=128, show_spinner=False, hash_funcs={pd.DataFrame: _history_fingerprint})
+def _compute_technical_indicators(history):
+    """Calculate technical indicators for a price history (cached across reruns)"""
+    
+    indicators = {}
+    
+    close = history['Close'].to_numpy(dtype=np.float64)
+    
+    # Simple Moving Averages (SMA_20 shares its window with the Bollinger Bands)
+    sma_20, std_20 = _moving_mean_std(close, 20)
+    indicators['SMA_20'] = pd.Series(sma_20, index=history.index)
+    for window in (50, 200):
+        indicators[f'SMA_{window}'] = pd.Series(_moving_mean(close, window), index=history.index)
+    
+    # Exponential Moving Average
+    indicators['EMA_12'] = history['Close'].ewm(span=12).mean()
+    indicators['EMA_26'] = history['Close'].ewm(span=26).mean()
+    
+    # MACD
+    indicators['MACD'] = indicators['EMA_12'] - indicators['EMA_26']
+    indicators['MACD_Signal'] = indicators['MACD'].ewm(span=9).mean()
+    
+    # RSI (Relative Strength Index)
+    delta = np.diff(close, prepend=close[0])
+    delta = np.where(np.isnan(delta), 0.0, delta)
+    gain = _moving_mean(np.maximum(delta, 0.0), 14)
+    loss = _moving_mean(-np.minimum(delta, 0.0), 14)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rs = gain / loss
+    indicators['RSI'] = pd.Series(100 - (100 / (1 + rs)), index=history.index)
+    
+    # Bollinger Bands
+    indicators['Bollinger_Upper'] = pd.Series(sma_20 + (std_20 * 2), index=history.index)
+    indicators['Bollinger_Lower'] = pd.Series(sma_20 - (std_20 * 2), index=history.index)
+    
+    return indicators
 
 class StockAnalyzer:
     """Stock analysis class using Yahoo Finance API"""
@@ -21,78 +365,17 @@ class StockAnalyzer:
             dict: Dictionary containing stock info and historical data
         """
         try:
-            # Create ticker object
-            ticker = yf.Ticker(symbol)
-            
-            # Get stock info
-            info = ticker.info
-            
-            # Validate that we got valid data
-            if not info or 'symbol' not in info:
-                return None
-            
-            # Get historical data
-            history = ticker.history(period=period)
-            
-            if history.empty:
-                return None
-            
-            # Get additional financial data
-            financials = self._get_financial_data(ticker)
-            
-            return {
-                'info': info,
-                'history': history,
-                'financials': financials,
-                'symbol': symbol.upper()
-            }
+            return _fetch_stock_data(symbol, period)
             
         except Exception as e:
             st.error(f"Error fetching data for {symbol}: {str(e)}")
             return None
     
-    def _get_financial_data(self, ticker):
-        """Get additional financial data"""
-        
-        financial_data = {}
-        
-        try:
-            # Get quarterly financials
-            quarterly_financials = ticker.quarterly_financials
-            if not quarterly_financials.empty:
-                financial_data['quarterly_financials'] = quarterly_financials
-            
-            # Get balance sheet
-            balance_sheet = ticker.balance_sheet
-            if not balance_sheet.empty:
-                financial_data['balance_sheet'] = balance_sheet
-            
-            # Get cash flow
-            cashflow = ticker.cashflow
-            if not cashflow.empty:
-                financial_data['cashflow'] = cashflow
-                
-        except Exception as e:
-            # Financial data is optional, don't fail if unavailable
-            pass
-        
-        return financial_data
-    
     def get_real_time_price(self, symbol):
         """Get real-time price data"""
         
         try:
-            ticker = yf.Ticker(symbol)
-            todays_data = ticker.history(period='1d')
-            
-            if not todays_data.empty:
-                return {
-                    'current_price': todays_data['Close'].iloc[-1],
-                    'open_price': todays_data['Open'].iloc[-1],
-                    'high_price': todays_data['High'].iloc[-1],
-                    'low_price': todays_data['Low'].iloc[-1],
-                    'volume': todays_data['Volume'].iloc[-1]
-                }
+            return _fetch_real_time_price(symbol)
             
         except Exception as e:
             st.error(f"Error fetching real-time data for {symbol}: {str(e)}")
@@ -105,49 +388,19 @@ class StockAnalyzer:
         if history.empty:
             return {}
         
-        indicators = {}
-        
         try:
-            # Simple Moving Averages
-            indicators['SMA_20'] = history['Close'].rolling(window=20).mean()
-            indicators['SMA_50'] = history['Close'].rolling(window=50).mean()
-            indicators['SMA_200'] = history['Close'].rolling(window=200).mean()
-            
-            # Exponential Moving Average
-            indicators['EMA_12'] = history['Close'].ewm(span=12).mean()
-            indicators['EMA_26'] = history['Close'].ewm(span=26).mean()
-            
-            # MACD
-            indicators['MACD'] = indicators['EMA_12'] - indicators['EMA_26']
-            indicators['MACD_Signal'] = indicators['MACD'].ewm(span=9).mean()
-            
-            # RSI (Relative Strength Index)
-            delta = history['Close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            indicators['RSI'] = 100 - (100 / (1 + rs))
-            
-            # Bollinger Bands
-            sma_20 = indicators['SMA_20']
-            std_20 = history['Close'].rolling(window=20).std()
-            indicators['Bollinger_Upper'] = sma_20 + (std_20 * 2)
-            indicators['Bollinger_Lower'] = sma_20 - (std_20 * 2)
+            return _compute_technical_indicators(history)
             
         except Exception as e:
             st.warning(f"Error calculating technical indicators: {str(e)}")
         
-        return indicators
+        return {}
     
     def get_company_news(self, symbol):
         """Get recent news for the company"""
         
         try:
-            ticker = yf.Ticker(symbol)
-            news = ticker.news
-            
-            if news:
-                return news[:5]  # Return top 5 news items
+            return _fetch_company_news(symbol)
                 
         except Exception as e:
             st.warning(f"Error fetching news for {symbol}: {str(e)}")
@@ -157,45 +410,23 @@ class StockAnalyzer:
     def compare_stocks(self, symbols, period="1y"):
         """Compare multiple stocks"""
         
-        comparison_data = {}
-        
-        for symbol in symbols:
-            stock_data = self.get_stock_data(symbol, period)
-            if stock_data:
-                comparison_data[symbol] = stock_data
+        if not symbols:
+            return {}
         
-        return comparison_data
+        try:
+            return _fetch_comparison_data(list(symbols), period)
+            
+        except Exception as e:
+            st.error(f"Error fetching comparison data: {str(e)}")
+            return {}
     
     def get_market_summary(self):
         """Get major market indices summary"""
         
-        indices = {
-            "S&P 500": "^GSPC",
-            "Dow Jones": "^DJI", 
-            "NASDAQ": "^IXIC",
-            "Russell 2000": "^RUT"
-        }
-        
-        market_data = {}
-        
-        for name, symbol in indices.items():
-            try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(period="2d")
-                
-                if not hist.empty:
-                    current = hist['Close'].iloc[-1]
-                    previous = hist['Close'].iloc[-2] if len(hist) > 1 else current
-                    change = current - previous
-                    change_pct = (change / previous) * 100
-                    
-                    market_data[name] = {
-                        'current': current,
-                        'change': change,
-                        'change_pct': change_pct
-                    }
-                    
-            except Exception as e:
-                continue
+        try:
+            return _fetch_market_summary()
+            
+        except Exception as e:
+            st.warning(f"Error fetching market summary: {str(e)}")
         
-        return market_data
+        return {}
@@ -2,6 +2,57 @@ import re
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, GoodFriday, USMartinLutherKingJr, USPresidentsDay,
+    USMemorialDay, USLaborDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+)
+
+# Basic validation - 1-5 letters with an optional 1-2 letter exchange suffix
+_SYMBOL_RE = re.compile(r'^[A-Z]{1,5}(\.[A-Z]{1,2})?$')
+
+# Suffix thresholds for currency formatting
+_THOUSAND = 1e3
+_MILLION = 1e6
+_BILLION = 1e9
+
+class _NYSEHolidayCalendar(AbstractHolidayCalendar):
+    """Full-day closures observed by the New York Stock Exchange"""
+    
+    rules = [
+        # NYSE does not close the preceding Friday when New Year's Day is a Saturday
+        Holiday('New Years Day', month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday('Juneteenth', month=6, day=19, start_date='2022-06-19', observance=nearest_workday),
+        Holiday('Independence Day', month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday('Christmas', month=12, day=25, observance=nearest_workday)
+    ]
+
+# Shared instance so the holiday rules are evaluated and cached once
+_NYSE_CALENDAR = _NYSEHolidayCalendar()
+
+def _to_float(value):
+    """Convert a scalar to float, returning None for missing or non-numeric values"""
+    
+    if value is None:
+        return None
+    
+    # Plain numbers skip the conversion attempt entirely
+    if not isinstance(value, (int, float)):
+        try:
+            value = float(value)
+        except (ValueError, TypeError):
+            return None
+    
+    # NaN is the only value not equal to itself
+    if value != value:
+        return None
+    
+    return value
 
 def validate_symbol(symbol):
     """
@@ -19,11 +70,7 @@ def validate_symbol(symbol):
     # Remove whitespace and convert to uppercase
     symbol = symbol.strip().upper()
     
-    # Basic validation - alphanumeric characters, dots, and hyphens allowed
-    # Length between 1-5 characters typically
-    pattern = r'^[A-Z]{1,5}(\.[A-Z]{1,2})?$'
-    
-    return bool(re.match(pattern, symbol)) and len(symbol) >= 1
+    return bool(_SYMBOL_RE.match(symbol))
 
 def format_currency(value, currency="USD"):
     """
@@ -36,21 +83,21 @@ def format_currency(value, currency="USD"):
     Returns:
         str: Formatted currency string
     """
-    if value is None or pd.isna(value):
-        return "N/A"
+    value = _to_float(value)
     
-    try:
-        value = float(value)
-        if abs(value) >= 1e9:
-            return f"${value/1e9:.2f}B"
-        elif abs(value) >= 1e6:
-            return f"${value/1e6:.2f}M"
-        elif abs(value) >= 1e3:
-            return f"${value/1e3:.2f}K"
-        else:
-            return f"${value:.2f}"
-    except (ValueError, TypeError):
+    if value is None:
         return "N/A"
+    
+    abs_value = abs(value)
+    
+    if abs_value >= _BILLION:
+        return f"${value/_BILLION:.2f}B"
+    elif abs_value >= _MILLION:
+        return f"${value/_MILLION:.2f}M"
+    elif abs_value >= _THOUSAND:
+        return f"${value/_THOUSAND:.2f}K"
+    else:
+        return f"${value:.2f}"
 
 def format_percentage(value, decimal_places=2):
     """
@@ -63,15 +110,12 @@ def format_percentage(value, decimal_places=2):
     Returns:
         str: Formatted percentage string
     """
-    if value is None or pd.isna(value):
-        return "N/A"
+    value = _to_float(value)
     
-    try:
-        value = float(value)
-        formatted = f"{value:.{decimal_places}f}%"
-        return formatted
-    except (ValueError, TypeError):
+    if value is None:
         return "N/A"
+    
+    return f"{value:.{decimal_places}f}%"
 
 def format_large_number(value):
     """
@@ -163,29 +207,38 @@ def calculate_max_drawdown(prices):
     if prices.empty:
         return np.nan
     
-    # Calculate running maximum
-    running_max = prices.expanding().max()
+    values = prices.to_numpy(dtype=np.float64)
+    
+    # Calculate running maximum (fmax skips NaN like expanding().max())
+    running_max = np.fmax.accumulate(values)
     
-    # Calculate drawdown
-    drawdown = (prices - running_max) / running_max
+    # Calculate drawdown, leaving periods with a zero running maximum undefined
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = np.where(running_max != 0, (values - running_max) / running_max, np.nan)
+    
+    if np.isnan(drawdown).all():
+        return np.nan
     
-    return drawdown.min()
+    return float(np.nanmin(drawdown))
 
 def get_trading_days_in_period(start_date, end_date):
     """
-    Get number of trading days between two dates
+    Get number of NYSE trading days between two dates
     
     Args:
-        start_date (datetime): Start date
-        end_date (datetime): End date
+        start_date (datetime): Start date (included)
+        end_date (datetime): End date (excluded)
         
     Returns:
-        int: Number of trading days
+        int: Number of weekdays that are not NYSE holidays
     """
-    # Simple approximation - can be enhanced with actual trading calendar
-    total_days = (end_date - start_date).days
-    weekdays = total_days * (5/7)  # Approximate weekdays
-    return int(weekdays * 0.95)  # Account for holidays
+    start = pd.Timestamp(start_date).date()
+    end = pd.Timestamp(end_date).date()
+    
+    # Weekdays in [start, end), excluding NYSE holidays
+    holidays = _NYSE_CALENDAR.holidays(start, end).to_numpy(dtype='datetime64[D]')
+    
+    return int(np.busday_count(start, end, holidays=holidays))
 
 def clean_financial_data(data):
     """